@@ -0,0 +1,23 @@
+from yada.argname import ArgumentName
+
+
+def test_argname():
+    argname = ArgumentName(dclass=None, names=[]).add("method").add("_max_length")
+    assert argname.get_argname() == "--method._max-length"
+    assert argname.get_fieldname() == "method._max_length"
+    # names are computed once and reused
+    assert argname.get_argname() is argname.get_argname()
+
+    argname = ArgumentName(dclass=None, names=["max_length"], dash=False)
+    assert argname.get_argname() == "--max_length"
+
+
+def test_argname_prefix():
+    parent = ArgumentName(dclass=None, names=["a_1"])
+    child = parent.add("top_k")
+    assert child.names == ["a_1", "top_k"]
+    assert child.get_argname() == "--a-1.top-k"
+    assert child.get_fieldname() == "a_1.top_k"
+    # adding a name does not modify the parent
+    assert parent.names == ["a_1"]
+    assert parent.get_argname() == "--a-1"
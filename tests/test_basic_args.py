@@ -1,6 +1,11 @@
+import sys
 from dataclasses import dataclass
+from typing import Literal, Union
+
+import pytest
 
 import yada
+from yada.exceptions import NotSupportedType
 
 
 @dataclass
@@ -23,3 +28,49 @@ def test_basic_dataclass():
         ]
     )
     assert args == BasicArgs(10, "hello", 10.4)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="requires KW_ONLY")
+def test_kw_only_dataclass():
+    from dataclasses import KW_ONLY
+
+    @dataclass
+    class KwOnlyArgs:
+        integer: int
+        _: KW_ONLY
+        string: str
+        flag: bool = False
+
+    parser = yada.Parser1(KwOnlyArgs)
+    args = parser.parse_args(["--integer", "10", "--string", "hello"])
+    assert args == KwOnlyArgs(10, string="hello", flag=False)
+    args = parser.parse_args(["--integer", "1", "--string", "a", "--flag", "true"])
+    assert args == KwOnlyArgs(1, string="a", flag=True)
+
+
+@dataclass
+class LiteralArgs:
+    lit: Literal["b", "a"]
+    lit2: Literal["a", "b"]
+
+
+@dataclass
+class UnionArgs:
+    u: Union[int, str] = 1
+
+
+@dataclass
+class UnionArgs2:
+    w: Union[str, int] = 1
+
+
+def test_equal_annotations_are_analyzed_separately():
+    # typing treats Literal/Union with the same members in any order as equal
+    parser = yada.Parser1(LiteralArgs)
+    assert parser.parser._option_string_actions["--lit"].choices == ("b", "a")
+    assert parser.parser._option_string_actions["--lit2"].choices == ("a", "b")
+
+    with pytest.raises(NotSupportedType, match=r"Union\[int, str\] of field u"):
+        yada.Parser1(UnionArgs)
+    with pytest.raises(NotSupportedType, match=r"Union\[str, int\] of field w"):
+        yada.Parser1(UnionArgs2)
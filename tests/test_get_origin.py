@@ -1,6 +1,8 @@
-from typing import get_origin, get_args, Generic, TypeVar
+from typing import get_origin, get_args, Generic, Literal, TypeVar, Union
 from dataclasses import dataclass
 
+from yada.yada import get_origin_and_args
+
 K = TypeVar("K")
 V = TypeVar("V")
 
@@ -16,3 +18,11 @@ def test_origin():
     assert get_origin(MyPair[str, str]) == MyPair
     assert get_args(MyPair) == ()
     assert get_args(MyPair[str, str]) == (str, str)
+
+
+def test_get_origin_and_args_keeps_order():
+    # Literal/Union with the same members in any order are equal, but their args must not be shared
+    assert get_origin_and_args(Literal["b", "a"]) == (Literal, ("b", "a"))
+    assert get_origin_and_args(Literal["a", "b"]) == (Literal, ("a", "b"))
+    assert get_origin_and_args(Union[int, str]) == (Union, (int, str))
+    assert get_origin_and_args(Union[str, int]) == (Union, (str, int))
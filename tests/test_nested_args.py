@@ -26,3 +26,35 @@ def test_nested_dataclass():
         ]
     )
     assert args == NestedArgs("hello", CityArgs("NY"))
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@dataclass
+class NestedPointArgs:
+    name: str
+    point: Point
+
+
+def test_nested_field_parsers():
+    parser = yada.Parser1(
+        NestedPointArgs,
+        field_parsers={"point.x": lambda s: int(s) * 2},
+    )
+    args = parser.parse_args(["--name", "a", "--point.x", "1", "--point.y", "1"])
+    assert args == NestedPointArgs("a", Point(2, 1))
+
+
+def test_nested_field_parsers_levelsep():
+    # keys of field_parsers are separated by dot even when levelsep is not
+    parser = yada.Parser1(
+        NestedPointArgs,
+        levelsep="/",
+        field_parsers={"point.x": lambda s: int(s) * 2},
+    )
+    args = parser.parse_args(["--name", "a", "--point/x", "1", "--point/y", "1"])
+    assert args == NestedPointArgs("a", Point(2, 1))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Set
 
 import yada
 
@@ -132,3 +132,46 @@ def test_optional_class_not_none_default_factory():
     assert args == TrainArgsOptClassNotNoneDefaultFactory(Method("method_c"))
     args = parser.parse_args([])
     assert args == TrainArgsOptClassNotNoneDefaultFactory(Method("method_b"))
+
+
+@dataclass
+class MethodWithNested:
+    method: Method
+    topk: int = 1
+
+
+@dataclass
+class TrainArgsOptNestedClassNoneDefault:
+    method: Optional[MethodWithNested] = None
+
+
+def test_optional_nested_class_none_default():
+    parser = yada.Parser1(TrainArgsOptNestedClassNoneDefault)
+    args = parser.parse_args(["--method.method.name", "method_b"])
+    assert args == TrainArgsOptNestedClassNoneDefault(
+        MethodWithNested(Method("method_b"), 1)
+    )
+    args = parser.parse_args(["--method.topk", "5"])
+    assert args == TrainArgsOptNestedClassNoneDefault(
+        MethodWithNested(Method("method_a"), 5)
+    )
+    args = parser.parse_args([])
+    assert args == TrainArgsOptNestedClassNoneDefault(None)
+
+
+@dataclass
+class Tags:
+    tags: Set[str]
+
+
+@dataclass
+class TrainArgsOptSetClassNoneDefault:
+    tags: Optional[Tags] = None
+
+
+def test_optional_class_with_set_none_default():
+    parser = yada.Parser1(TrainArgsOptSetClassNoneDefault)
+    args = parser.parse_args([])
+    assert args == TrainArgsOptSetClassNoneDefault(None)
+    args = parser.parse_args(["--tags.tags", "a", "b", "a"])
+    assert args == TrainArgsOptSetClassNoneDefault(Tags({"a", "b"}))
@@ -0,0 +1,30 @@
+import argparse
+
+import pytest
+
+from yada.string_parser import StringParser
+
+
+def test_bool():
+    parser = StringParser("--flag")
+    assert parser.bool("Yes") is True
+    assert parser.bool("0") is False
+    with pytest.raises(argparse.ArgumentTypeError):
+        parser.bool("maybe")
+
+
+def test_literal():
+    parser = StringParser("--choice")
+    assert parser.literal("none") is None
+    assert parser.literal("12") == 12
+    assert parser.literal("False") is False
+    assert parser.literal("abc") == "abc"
+
+
+def test_wrap_nullable():
+    wrapper = StringParser.wrap_nullable(int)
+    assert wrapper("None") is None
+    assert wrapper("10") == 10
+    # fields with the same parsing function and none keywords share the wrapper
+    assert StringParser.wrap_nullable(int, {"none", "None"}) is wrapper
+    assert StringParser.wrap_nullable(int, {"null"}) is not wrapper
@@ -1,30 +1,90 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
+
+_UNDERSCORE_TO_DASH = str.maketrans("_", "-")
 
 
 class ArgumentName:
     """Naming convention for argparse arguments"""
 
+    __slots__ = (
+        "dclass",
+        "dash",
+        "levelsep",
+        "parent",
+        "name",
+        "_names",
+        "_argname",
+        "_fieldname",
+    )
+
     def __init__(
-        self, dclass, names: List[str], dash: bool = True, levelsep: str = "."
+        self,
+        dclass,
+        names: Optional[List[str]],
+        dash: bool = True,
+        levelsep: str = ".",
+        parent: Optional[ArgumentName] = None,
+        name: str = "",
     ):
         self.dclass = dclass
-        self.names = names
         self.dash = dash
         self.levelsep = levelsep
+        # names created by `add` keep a reference to their parent and the added name instead of copying
+        # the parent's names (names is None), so they share the parent's (cached) prefix
+        self.parent = parent
+        self.name = name
+        self._names = names
+        # names do not change after construction, so the joined names are computed once on the first call
+        self._argname: Optional[str] = None
+        self._fieldname: Optional[str] = None
+
+    @property
+    def names(self) -> List[str]:
+        if self._names is None:
+            assert self.parent is not None
+            self._names = self.parent.names + [self.name]
+        return self._names
 
     def add(self, name: str) -> ArgumentName:
-        return ArgumentName(self.dclass, self.names + [name], self.dash, self.levelsep)
+        return ArgumentName(
+            self.dclass, None, self.dash, self.levelsep, parent=self, name=name
+        )
 
     def get_argname(self) -> str:
-        return "--" + self.levelsep.join((self._norm_name(name) for name in self.names))
+        if self._argname is None:
+            if self.parent is None:
+                self._argname = "--" + self.levelsep.join(
+                    (self._norm_name(name) for name in self.names)
+                )
+            elif self.parent._is_empty():
+                self._argname = "--" + self._norm_name(self.name)
+            else:
+                self._argname = (
+                    self.parent.get_argname()
+                    + self.levelsep
+                    + self._norm_name(self.name)
+                )
+        return self._argname
 
     def get_fieldname(self) -> str:
-        return self.levelsep.join(self.names)
+        if self._fieldname is None:
+            if self.parent is None:
+                self._fieldname = self.levelsep.join(self.names)
+            elif self.parent._is_empty():
+                self._fieldname = self.name
+            else:
+                self._fieldname = (
+                    self.parent.get_fieldname() + self.levelsep + self.name
+                )
+        return self._fieldname
+
+    def _is_empty(self) -> bool:
+        return self.parent is None and len(self.names) == 0
 
     def _norm_name(self, name: str):
-        if self.dash:
-            if name[0].startswith("_"):
-                return "_" + name[1:].replace("_", "-")
-            return name.replace("_", "-")
-        return name
+        if not self.dash or "_" not in name:
+            return name
+        if name[0] == "_":
+            return "_" + name[1:].translate(_UNDERSCORE_TO_DASH)
+        return name.translate(_UNDERSCORE_TO_DASH)
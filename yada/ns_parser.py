@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 import argparse
-from dataclasses import MISSING, dataclass
+import inspect
+import sys
+from dataclasses import MISSING
 from typing import (
     Any,
     Callable,
@@ -10,7 +12,13 @@ from typing import (
 )
 
 
+def identity(x):
+    return x
+
+
 class NamespaceParser(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def deserialize(self, ns: argparse.Namespace):
         pass
@@ -19,30 +27,79 @@ class NamespaceParser(ABC):
     def is_presented(self, ns: argparse.Namespace):
         pass
 
+    def get_deserialize_fn(self) -> Callable[[argparse.Namespace], Any]:
+        """Get the most direct function to deserialize a namespace"""
+        return self.deserialize
 
-@dataclass
-class SingleFieldParser(NamespaceParser):
-    field_name: str
-    default_value: Any
-    postprocess: Callable[[Any], Any] = lambda x: x
 
-    def deserialize(self, ns: argparse.Namespace):
-        value = getattr(ns, self.field_name.replace("-", "_"))
-        if value is MISSING:
+class SingleFieldParser(NamespaceParser):
+    __slots__ = ("field_name", "default_value", "postprocess", "_attr")
+
+    def __init__(
+        self,
+        field_name: str,
+        default_value: Any,
+        postprocess: Callable[[Any], Any] = identity,
+    ):
+        self.field_name = field_name
+        self.default_value = default_value
+        self.postprocess = postprocess
+        # name of the attribute storing the value in the namespace. argparse sets the attribute via setattr, which
+        # interns its name, so interning our copy lets the namespace's dict lookup match by identity
+        self._attr = sys.intern(field_name.replace("-", "_"))
+
+    def deserialize(self, ns: argparse.Namespace, _MISSING=MISSING):
+        value = ns.__dict__.get(self._attr, _MISSING)
+        if value is _MISSING:
             value = self.default_value
         return self.postprocess(value)
 
-    def is_presented(self, ns: argparse.Namespace):
-        return getattr(ns, self.field_name.replace("-", "_")) is not MISSING
+    def is_presented(self, ns: argparse.Namespace, _MISSING=MISSING):
+        return ns.__dict__.get(self._attr, _MISSING) is not _MISSING
 
 
-@dataclass
 class MultiFieldParser(NamespaceParser):
-    type: Type
-    field_parsers: Dict[str, NamespaceParser]
-    is_default_null: bool
-    is_nullable: bool
-    null_argname: str
+    __slots__ = (
+        "type",
+        "field_parsers",
+        "is_default_null",
+        "is_nullable",
+        "null_argname",
+        "_single_fields",
+        "_multi_fields",
+        "_check_order",
+        "_deserialize",
+    )
+
+    def __init__(
+        self,
+        type: Type,
+        field_parsers: Dict[str, NamespaceParser],
+        is_default_null: bool,
+        is_nullable: bool,
+        null_argname: str,
+    ):
+        self.type = type
+        self.field_parsers = field_parsers
+        self.is_default_null = is_default_null
+        self.is_nullable = is_nullable
+        self.null_argname = null_argname
+        # fields split by their parser type, used to check presence & deserialize in one pass (case 2.B)
+        self._single_fields = tuple(
+            (fname, f)
+            for fname, f in field_parsers.items()
+            if isinstance(f, SingleFieldParser)
+        )
+        self._multi_fields = tuple(
+            (fname, f)
+            for fname, f in field_parsers.items()
+            if not isinstance(f, SingleFieldParser)
+        )
+        # order to check if any field is presented, fields that are more likely to be presented come first
+        self._check_order = tuple(
+            sorted(field_parsers.values(), key=_presence_likelihood_key)
+        )
+        self._deserialize = codegen_deserialize(self)
 
     def deserialize(self, ns: argparse.Namespace):
         """Deserialize a dataclass.
@@ -74,36 +131,109 @@ class MultiFieldParser(NamespaceParser):
 
         Case 1 is equivalent to 2.A. We only need to distinguish between 2.A and 2.B/C, we can do it via `is_nullable`.
         """
-        if not self.is_nullable:
-            # case 1 or 2.A
-            obj = {}
-            for fname, f in self.field_parsers.items():
-                value = f.deserialize(ns)
-                obj[fname] = value
-            return self.type(**obj)
-
-        if getattr(ns, self.null_argname) is None:
-            # null_argname is presented, then the value is None
-            return None
-
-        # distinguish between 2.B and 2.C
-        if not self.is_default_null:
-            # case 2.C
-            obj = {}
-            for name, f in self.field_parsers.items():
-                value = f.deserialize(ns)
-                obj[name] = value
-            return self.type(**obj)
-
-        # case 2.B
-        obj = {}
-        if all(not f.is_presented(ns) for f in self.field_parsers.values()):
-            return None
-
-        for fname, f in self.field_parsers.items():
-            value = f.deserialize(ns)
-            obj[fname] = value
-        return self.type(**obj)
+        return self._deserialize(ns)
 
     def is_presented(self, ns: argparse.Namespace):
-        return any(f.is_presented(ns) for f in self.field_parsers.values())
+        return any(f.is_presented(ns) for f in self._check_order)
+
+    def get_deserialize_fn(self) -> Callable[[argparse.Namespace], Any]:
+        return self._deserialize
+
+
+def _presence_likelihood_key(f: NamespaceParser) -> int:
+    """Rank how likely users provide a value for a field: fields without default values are most likely
+    to be provided, then fields with non-None default values, then fields defaulting to None. Nested
+    dataclasses come last as checking them requires checking all of their fields.
+    """
+    if isinstance(f, SingleFieldParser):
+        if f.default_value is MISSING:
+            return 0
+        if f.default_value is not None:
+            return 1
+        return 2
+    return 3
+
+
+def codegen_deserialize(
+    parser: MultiFieldParser,
+) -> Callable[[argparse.Namespace], Any]:
+    """Generate a deserialize function specialized for the dataclass of the parser.
+
+    The generated function reads the fields directly from the namespace and calls the dataclass's constructor,
+    following the same cases described in `MultiFieldParser.deserialize`.
+    """
+    env: Dict[str, Any] = {"MISSING": MISSING, "TYPE": parser.type}
+    # argparse.Namespace stores the values in its __dict__, reading it directly avoids the attribute lookup machinery
+    lines = ["def deserialize(ns):", "    values = ns.__dict__"]
+
+    if parser.is_nullable:
+        env["null_argname"] = sys.intern(parser.null_argname)
+        lines += [
+            "    if values[null_argname] is None:",
+            "        return None",
+        ]
+    # case 2.B is the only case where we need to check if any field is presented
+    check_presented = parser.is_nullable and parser.is_default_null
+    if check_presented:
+        lines.append("    is_presented = False")
+
+    # mapping from field name to the variable holding its value
+    field_vars: Dict[str, str] = {}
+    # postprocessing is deferred until we know the dataclass is presented as the postprocess functions
+    # may not accept missing values (e.g., set(MISSING))
+    postprocess_lines = []
+    for i, (fname, f) in enumerate(parser._single_fields):
+        env[f"attr{i}"] = f._attr
+        env[f"default{i}"] = f.default_value
+        lines += [
+            f"    v{i} = values.get(attr{i}, MISSING)",
+            f"    if v{i} is MISSING:",
+            f"        v{i} = default{i}",
+        ]
+        if check_presented:
+            lines += ["    else:", "        is_presented = True"]
+        if f.postprocess is not identity:
+            env[f"postprocess{i}"] = f.postprocess
+            postprocess_lines.append(f"    v{i} = postprocess{i}(v{i})")
+        field_vars[fname] = f"v{i}"
+
+    if check_presented:
+        for i, (fname, f) in enumerate(parser._multi_fields):
+            env[f"is_presented{i}"] = f.is_presented
+        cond = " or ".join(
+            f"is_presented{i}(ns)" for i in range(len(parser._multi_fields))
+        )
+        lines += [
+            f"    if not (is_presented{' or ' + cond if cond else ''}):",
+            "        return None",
+        ]
+    lines += postprocess_lines
+    for i, (fname, f) in enumerate(parser._multi_fields):
+        # call the generated functions of nested dataclasses directly instead of through their parsers
+        env[f"deserialize{i}"] = f.get_deserialize_fn()
+        lines.append(f"    m{i} = deserialize{i}(ns)")
+        field_vars[fname] = f"m{i}"
+
+    # pass the values positionally as long as they follow the order of the constructor's parameters, which is
+    # cheaper than matching keyword arguments. the rest (e.g., kw_only fields) are passed by keywords
+    args = []
+    for param in inspect.signature(parser.type).parameters.values():
+        if (
+            param.kind is not param.POSITIONAL_OR_KEYWORD
+            or param.name not in field_vars
+        ):
+            break
+        args.append(field_vars.pop(param.name))
+    args.extend(f"{fname}={var}" for fname, var in field_vars.items())
+    lines.append(f"    return TYPE({', '.join(args)})")
+
+    # similar to dataclasses, the function is created inside a factory function so that the values in env
+    # are accessed as closure variables instead of global variables
+    src = "\n".join(
+        [f"def create_fn({', '.join(env)}):"]
+        + [f"    {line}" for line in lines]
+        + ["    return deserialize"]
+    )
+    fn_ns: Dict[str, Any] = {}
+    exec(compile(src, f"<yada:{parser.type.__qualname__}>", "exec"), fn_ns)
+    return fn_ns["create_fn"](**env)
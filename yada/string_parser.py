@@ -1,28 +1,41 @@
 import argparse
-from typing import Callable, Optional, Set, Tuple, Union
+import weakref
+from typing import Callable, FrozenSet, Optional, Set, Tuple, Union
 
 from yada.argname import ArgumentName
 
+# mapping from (lowercase) truthy/falsy tokens to their boolean values
+BOOL_VALUES = {
+    **dict.fromkeys(("yes", "true", "t", "y", "1"), True),
+    **dict.fromkeys(("no", "false", "f", "n", "0"), False),
+}
+NONE_VALUES = frozenset(("None", "none"))
+
+# nullable wrappers shared between fields having the same parsing function and none keywords. the wrappers
+# are weakly referenced so they are released together with the parsers using them
+_NULLABLE_WRAPPERS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
 
 class StringParser:
     """Provides different parsing method (argparse.Argument's type) to convert arg string to the desired type."""
 
+    __slots__ = ("argname",)
+
     def __init__(self, argname: Union[str, ArgumentName]):
         self.argname = argname
 
     def bool(self, v: str) -> bool:
         """Parsing a boolean value"""
-        if v.lower() in ("yes", "true", "t", "y", "1"):
-            return True
-        elif v.lower() in ("no", "false", "f", "n", "0"):
-            return False
+        value = BOOL_VALUES.get(v.lower())
+        if value is not None:
+            return value
         raise argparse.ArgumentTypeError(
             f"{self._get_argname()} expects a truthy value (one of yes/no, true/false, t/f, y/n, 1/0 (case insensitive)), but got {v}"
         )
 
     def empty_or_none(self, v: str) -> Optional[str]:
         """Parsing a value that must be either empty string or None"""
-        if v in ("None", "none"):
+        if v in NONE_VALUES:
             return None
         if v == "":
             return ""
@@ -31,27 +44,43 @@ class StringParser:
             f"{self._get_argname()} expects an empty string or None/none value but got {v}"
         )
 
-    def literal(self, v: str) -> Union[int, str, None]:
+    @staticmethod
+    def literal(v: str) -> Union[int, str, None]:
         """Parsing a literal value used in typing.Literal arguments"""
-        if v in ("None", "none"):
+        if v in NONE_VALUES:
             return None
-        if v.isdigit():
+        if v.isdecimal():
             return int(v)
-        if v.lower() in ("yes", "true", "t", "y", "1"):
-            return True
-        if v.lower() in ("no", "false", "f", "n", "0"):
-            return False
+        value = BOOL_VALUES.get(v.lower())
+        if value is not None:
+            return value
         return v
 
     @staticmethod
     def wrap_nullable(
-        fn: Callable, none_keywords: Union[Set[str], Tuple[str, ...]] = ("None", "none")
+        fn: Callable,
+        none_keywords: Union[Set[str], FrozenSet[str], Tuple[str, ...]] = NONE_VALUES,
     ):
-        def wrapper(s):
-            if s in none_keywords:
-                return None
-            return fn(s)
+        if not isinstance(none_keywords, frozenset):
+            none_keywords = frozenset(none_keywords)
+
+        key = (fn, none_keywords)
+        try:
+            wrapper = _NULLABLE_WRAPPERS.get(key)
+        except TypeError:
+            # unhashable parsing function, we can't share its wrapper
+            key = None
+            wrapper = None
+
+        if wrapper is None:
+
+            def wrapper(s, _fn=fn, _none_keywords=none_keywords):
+                if s in _none_keywords:
+                    return None
+                return _fn(s)
 
+            if key is not None:
+                _NULLABLE_WRAPPERS[key] = wrapper
         return wrapper
 
     def _get_argname(self):
@@ -3,14 +3,16 @@ from __future__ import annotations
 import argparse
 import collections.abc as abc
 from dataclasses import MISSING, Field, fields, is_dataclass
-from functools import partial
+from functools import lru_cache
 from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
     Generic,
     List,
     Literal,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
@@ -25,14 +27,151 @@ from typing import (
 from loguru import logger
 from yada.argname import ArgumentName
 from yada.exceptions import NotSupportedType
-from yada.ns_parser import MultiFieldParser, NamespaceParser, SingleFieldParser
-from yada.string_parser import StringParser
+from yada.ns_parser import (
+    MultiFieldParser,
+    NamespaceParser,
+    SingleFieldParser,
+)
+from yada.string_parser import NONE_VALUES, StringParser
 
 C = TypeVar("C")
 R = TypeVar("R")
 NoneType = type(None)
 
 
+class DataclassSpec(NamedTuple):
+    """Introspected information of a dataclass needed to generate its arguments"""
+
+    fields: Tuple[Field, ...]
+    type_hints: Dict[str, type]
+
+
+@lru_cache(maxsize=None)
+def get_dataclass_spec(dclass: type) -> DataclassSpec:
+    """Get the spec of a dataclass, computing it only the first time the dataclass is seen.
+
+    Dataclass annotations are static so the cache never needs to be invalidated. It keeps a reference to
+    every dataclass that has been parsed, which is bounded by the number of dataclasses in the program.
+    """
+    dfields = fields(dclass)
+    return DataclassSpec(
+        fields=dfields,
+        type_hints=get_type_hints(dclass),
+    )
+
+
+# the cache is keyed by the identity of the type annotation instead of its equality because typing treats Literal
+# and Union with the same members in any order as equal, while their args keep the order they are written in.
+# the annotation is kept in the value so that its id is not reused.
+_ORIGIN_AND_ARGS: Dict[int, Tuple[Any, Tuple[Any, Tuple[Any, ...]]]] = {}
+
+
+def get_origin_and_args(tp) -> Tuple[Any, Tuple[Any, ...]]:
+    """Cached version of `(get_origin(tp), get_args(tp))`"""
+    entry = _ORIGIN_AND_ARGS.get(id(tp))
+    if entry is None:
+        entry = _ORIGIN_AND_ARGS[id(tp)] = (tp, (get_origin(tp), get_args(tp)))
+    return entry[1]
+
+
+class FieldTypeInfo(NamedTuple):
+    """Analysis of a field's type annotation, which only depends on the annotation so it is shared by all fields
+    with the same annotation object.
+    """
+
+    # the original type annotation
+    annotation: Any
+    # the type to parse after converting Optional[T] to T (or str for Union[StrEnum, str])
+    field_type: Any
+    origin: Any
+    args: Tuple[Any, ...]
+    is_nullable: bool
+    # whether field_type is a dataclass
+    is_dataclass: bool
+
+
+def _analyze_field_type(annotation) -> FieldTypeInfo:
+    field_type = annotation
+    origin, args = get_origin_and_args(field_type)
+
+    # detect Optional[T] to set nullable to True
+    # then we convert field type from Optional[T] to T and process as normal
+    is_nullable = False
+    if origin is Union:
+        if len(args) == 2:
+            # fast path for the common Optional[T] == Union[T, None]
+            if args[1] is NoneType:
+                non_null_args = args[:1]
+            elif args[0] is NoneType:
+                non_null_args = args[1:]
+            else:
+                non_null_args = args
+        else:
+            non_null_args = tuple(arg for arg in args if arg is not NoneType)
+        if len(non_null_args) != len(args):
+            is_nullable = True
+            args = non_null_args
+
+            if len(args) == 1:
+                # Optional[T] -> T
+                field_type = args[0]
+                origin, args = get_origin_and_args(field_type)
+
+    if origin is Union:
+        for arg in args:
+            # args that are not classes (e.g., List[str]) are checked first to avoid issubclass raising TypeError
+            if not (isinstance(arg, type) and issubclass(arg, str)):
+                break
+        else:
+            # handle special case of Union[StrEnum, str]
+            is_nullable = False
+            field_type = str
+            origin, args = None, ()
+
+    return FieldTypeInfo(
+        annotation,
+        field_type,
+        origin,
+        args,
+        is_nullable,
+        is_dataclass=origin is None and is_dataclass(field_type),
+    )
+
+
+# keyed by the identity of the annotation for the same reason as _ORIGIN_AND_ARGS, the annotation is kept
+# in FieldTypeInfo so that its id is not reused
+_FIELD_TYPE_INFOS: Dict[int, FieldTypeInfo] = {}
+
+
+def get_field_type_info(annotation) -> FieldTypeInfo:
+    """Get the (cached) analysis of a field's type annotation. Unions that are still unions in the result
+    are not supported.
+    """
+    info = _FIELD_TYPE_INFOS.get(id(annotation))
+    if info is None:
+        info = _FIELD_TYPE_INFOS[id(annotation)] = _analyze_field_type(annotation)
+    return info
+
+
+# base options of add_argument for a field, copying it is cheaper than building a new dict for every field
+_ADD_ARGUMENT_OPTIONS = {"default": MISSING, "required": False, "help": ""}
+
+
+def _get_deserialize_fn(
+    value_parser: Union[
+        Dict[str, NamespaceParser], List[NamespaceParser], NamespaceParser
+    ],
+) -> Callable[[argparse.Namespace], Any]:
+    """Get a function converting a namespace to the result of YadaParser given its value_parser"""
+    if isinstance(value_parser, dict):
+        items = tuple((k, v.get_deserialize_fn()) for k, v in value_parser.items())
+        return lambda ns: {k: fn(ns) for k, fn in items}
+    if isinstance(value_parser, list):
+        fns = tuple(v.get_deserialize_fn() for v in value_parser)
+        return lambda ns: [fn(ns) for fn in fns]
+    return value_parser.get_deserialize_fn()
+
+
 class YadaParser(Generic[C, R]):
     """Parsing parameters defined by one or multiple dataclass.
 
@@ -106,48 +245,72 @@ class YadaParser(Generic[C, R]):
         self.value_parser: Union[
             Dict[str, NamespaceParser], List[NamespaceParser], NamespaceParser
         ]
-        argname = ArgumentName(dclass=None, names=[], dash=dash, levelsep=levelsep)
-        if is_dataclass(classes):
-            argname.dclass = classes
-            self.value_parser = self.add_dataclass(classes, argname)
-        elif isinstance(classes, (list, tuple)):
-            self.value_parser = []
-            for i, dclass in enumerate(classes):
-                argname.dclass = dclass
-                if namespaces is not None and namespaces[i] != "":
-                    dargname = argname.add(namespaces[i])
-                else:
-                    dargname = argname
-                self.value_parser.append(self.add_dataclass(dclass, dargname))
-        elif isinstance(classes, dict):
-            self.value_parser = {}
-            for namespace, dclass in classes.items():
-                argname.dclass = dclass
-                self.value_parser[namespace] = self.add_dataclass(
-                    dclass, argname.add(namespace)
+        # common container types are dispatched by their exact type, others fall back to the checks below
+        init_fn = self._init_fns.get(type(classes))
+        if init_fn is None:
+            if is_dataclass(classes):
+                init_fn = "_init_single"
+            elif isinstance(classes, (list, tuple)):
+                init_fn = "_init_sequence"
+            elif isinstance(classes, dict):
+                init_fn = "_init_mapping"
+            else:
+                raise TypeError(
+                    f"Expect a dataclass, or a sequence or mapping of dataclasses, but got {classes}"
                 )
+        self.value_parser = getattr(self, init_fn)(classes, namespaces)
+        # the shape of value_parser is fixed, so the function converting a namespace to the result is selected once
+        self._deserialize = _get_deserialize_fn(self.value_parser)
 
-    def parse_args(self, args: Optional[Sequence[str]] = None) -> R:
-        ns = self.parser.parse_args(args)
+    def _init_single(
+        self, dclass, namespaces: Optional[Sequence[str]]
+    ) -> NamespaceParser:
+        # namespaces is not used as there is only one dataclass
+        return self.add_dataclass(dclass, self._root_argname(dclass))
+
+    def _init_sequence(
+        self, classes: Sequence, namespaces: Optional[Sequence[str]]
+    ) -> List[NamespaceParser]:
+        value_parser = []
+        for i, dclass in enumerate(classes):
+            argname = self._root_argname(dclass)
+            if namespaces is not None and namespaces[i] != "":
+                argname = argname.add(namespaces[i])
+            value_parser.append(self.add_dataclass(dclass, argname))
+        return value_parser
+
+    def _init_mapping(
+        self, classes: Dict[str, Any], namespaces: Optional[Sequence[str]]
+    ) -> Dict[str, NamespaceParser]:
+        # namespaces is not used as the keys of classes are the namespaces
+        return {
+            namespace: self.add_dataclass(
+                dclass, self._root_argname(dclass).add(namespace)
+            )
+            for namespace, dclass in classes.items()
+        }
 
-        if isinstance(self.value_parser, dict):
-            return {k: v.deserialize(ns) for k, v in self.value_parser.items()}  # type: ignore
-        elif isinstance(self.value_parser, list):
-            return [v.deserialize(ns) for v in self.value_parser]  # type: ignore
-        else:
-            return self.value_parser.deserialize(ns)  # type: ignore
+    # names of the methods to initialize the parser by the exact type of classes, the methods are looked up on
+    # the instance so that subclasses can override them
+    _init_fns = {
+        list: "_init_sequence",
+        tuple: "_init_sequence",
+        dict: "_init_mapping",
+    }
+
+    def _root_argname(self, dclass) -> ArgumentName:
+        return ArgumentName(
+            dclass=dclass, names=[], dash=self.dash, levelsep=self.levelsep
+        )
+
+    def parse_args(self, args: Optional[Sequence[str]] = None) -> R:
+        return self._deserialize(self.parser.parse_args(args))
 
     def parse_known_args(
         self, args: Optional[Sequence[str]] = None
     ) -> Tuple[R, List[str]]:
         ns, remain_args = self.parser.parse_known_args(args)
-
-        if isinstance(self.value_parser, dict):
-            return {k: v.deserialize(ns) for k, v in self.value_parser.items()}, remain_args  # type: ignore
-        elif isinstance(self.value_parser, list):
-            return [v.deserialize(ns) for v in self.value_parser], remain_args  # type: ignore
-        else:
-            return self.value_parser.deserialize(ns), remain_args  # type: ignore
+        return self._deserialize(ns), remain_args
 
     def add_dataclass(
         self,
@@ -166,7 +329,7 @@ class YadaParser(Generic[C, R]):
             default_factory: the default factory of the dataclass
             is_nullable: whether the dataclass is nullable
         """
-        type_hints: Dict[str, type] = get_type_hints(dclass)
+        spec = get_dataclass_spec(dclass)
 
         if default is not MISSING:
             default_instance = default
@@ -175,14 +338,6 @@ class YadaParser(Generic[C, R]):
         else:
             default_instance = None
 
-        deser = MultiFieldParser(
-            type=dclass,
-            field_parsers={},
-            is_default_null=default_instance is None,
-            is_nullable=is_nullable,
-            null_argname=argname.get_fieldname(),
-        )
-
         if is_nullable:
             self.parser.add_argument(
                 argname.get_argname(),
@@ -191,12 +346,17 @@ class YadaParser(Generic[C, R]):
                 required=False,
             )
 
-        for field in fields(dclass):
+        type_hints = spec.type_hints
+        has_default_instance = default_instance is not None
+        add_field = self.add_field
+
+        field_parsers: Dict[str, NamespaceParser] = {}
+        for field in spec.fields:
             if not field.init:
-                logger.trace(
-                    "Only fields with init=True are supported (included in the generated __init__ method). Skipping field: {} in {}"
-                    ".".join(argname.names),
-                    dclass.__qualname__,
+                logger.opt(lazy=True).trace(
+                    "Only fields with init=True are supported (included in the generated __init__ method). Skipping field: {} in {}",
+                    lambda: ".".join(argname.names + [field.name]),
+                    lambda: dclass.__qualname__,
                 )
                 continue
 
@@ -204,7 +364,7 @@ class YadaParser(Generic[C, R]):
             field_type = type_hints[field.name]
 
             field_default = field.default
-            if default_instance is not None:
+            if has_default_instance:
                 # we have the default value, which may set different value from the field's default value
                 # so it has higher priority
                 field_default = getattr(default_instance, field.name)
@@ -212,7 +372,7 @@ class YadaParser(Generic[C, R]):
                 field_default = field.default_factory()
             field_required = field_default is MISSING and not is_nullable
 
-            deser.field_parsers[field.name] = self.add_field(
+            field_parsers[field.name] = add_field(
                 field_argname,
                 field,
                 field_type,
@@ -220,7 +380,13 @@ class YadaParser(Generic[C, R]):
                 default_value=field_default,
             )
 
-        return deser
+        return MultiFieldParser(
+            type=dclass,
+            field_parsers=field_parsers,
+            is_default_null=not has_default_instance,
+            is_nullable=is_nullable,
+            null_argname=argname.get_fieldname(),
+        )
 
     def add_field(
         self,
@@ -230,123 +396,132 @@ class YadaParser(Generic[C, R]):
         is_required: bool,
         default_value: Any,
     ) -> NamespaceParser:
-        origin_field_type = field_type
-        origin = get_origin(field_type)
-        args = get_args(field_type)
-
-        # detect Optional[T] to set nullable to True
-        # then we convert field type from Optional[T] to T and process as normal
-        if origin is Union:
-            if any(arg is NoneType for arg in args):
-                args = [arg for arg in args if arg is not NoneType]
-                is_nullable = True
-
-                if len(args) == 1:
-                    # Optional[T] -> T
-                    field_type = args[0]
-                    origin = get_origin(field_type)
-                    args = get_args(field_type)
-            else:
-                is_nullable = False
-        else:
-            is_nullable = False
+        info = get_field_type_info(field_type)
+        field_type, origin, is_nullable = (
+            info.field_type,
+            info.origin,
+            info.is_nullable,
+        )
 
         if origin is Union:
-            all_str_args = True
-            for arg in args:
-                try:
-                    if not issubclass(arg, str):
-                        all_str_args = False
-                        break
-                except TypeError:
-                    all_str_args = False
-                    break
-
-            if all_str_args:
-                # handle special case of Union[StrEnum, str]
-                is_nullable = False
-                field_type = str
-            else:
-                raise NotSupportedType(
-                    argname,
-                    origin_field_type,
-                    "only `Union[X, NoneType]` (i.e., `Optional[X]`) is allowed for `Union` because"
-                    " we don't know how to parse different types from string.",
-                )
-            self.parser.add_argument(
-                argname.get_argname(),
-                **self.get_add_argument_options(
-                    argname, field, field_type, default_value, is_required, is_nullable
-                ),
-            )
-            return SingleFieldParser(
-                argname.get_fieldname(), default_value=default_value
+            raise NotSupportedType(
+                argname,
+                info.annotation,
+                "only `Union[X, NoneType]` (i.e., `Optional[X]`) is allowed for `Union` because"
+                " we don't know how to parse different types from string.",
             )
 
-        if origin is None or origin is Literal:
-            # not generic types
-            if is_dataclass(field_type):
-                return self.add_dataclass(
-                    field_type,
-                    argname,
-                    default=default_value,
-                    is_nullable=is_nullable,
-                )
+        add_field_fn = self._add_field_fns.get(origin)
+        if add_field_fn is None:
+            raise NotSupportedType(argname, field_type)
+        return getattr(self, add_field_fn)(
+            argname, field, info, is_required, default_value, is_nullable
+        )
 
-            # we assume it can be reconstructed from string
-            # some classes support this is enum.Enum, pathlib.Path
-            # TODO: raise an error if the class doesn't allow to construct from string
-            self.parser.add_argument(
-                argname.get_argname(),
-                **self.get_add_argument_options(
-                    argname, field, field_type, default_value, is_required, is_nullable
-                ),
-            )
-            return SingleFieldParser(
-                argname.get_fieldname(), default_value=default_value
+    def _add_scalar_field(
+        self,
+        argname: ArgumentName,
+        field: Field,
+        info: FieldTypeInfo,
+        is_required: bool,
+        default_value: Any,
+        is_nullable: bool,
+    ) -> NamespaceParser:
+        # not generic types
+        if info.is_dataclass:
+            return self.add_dataclass(
+                info.field_type,
+                argname,
+                default=default_value,
+                is_nullable=is_nullable,
             )
 
-        if origin is list or origin is set or origin is abc.Sequence:
-            assert len(args) == 1
-            self.parser.add_argument(
-                argname.get_argname(),
-                nargs="*",
-                **self.get_add_argument_options(
-                    argname,
-                    field,
-                    args[0],
-                    default_value,
-                    is_required,
-                    is_nullable=False,
-                ),
-            )
-            if origin is set:
-                return SingleFieldParser(
-                    argname.get_fieldname(),
-                    default_value=default_value,
-                    postprocess=set,
-                )
-            return SingleFieldParser(
-                argname.get_fieldname(), default_value=default_value
-            )
+        # we assume it can be reconstructed from string
+        # some classes support this is enum.Enum, pathlib.Path
+        # TODO: raise an error if the class doesn't allow to construct from string
+        self.parser.add_argument(
+            argname.get_argname(),
+            **self.get_add_argument_options(
+                argname,
+                field,
+                info.field_type,
+                default_value,
+                is_required,
+                is_nullable,
+                origin=info.origin,
+                args=info.args,
+            ),
+        )
+        return SingleFieldParser(argname.get_fieldname(), default_value=default_value)
 
-        if origin is dict:
-            self.parser.add_argument(
-                argname.get_argname(),
-                **self.get_add_argument_options(
-                    argname,
-                    field,
-                    field_type,
-                    default_value,
-                    is_required,
-                    is_nullable=False,
-                ),
-            )
+    def _add_sequence_field(
+        self,
+        argname: ArgumentName,
+        field: Field,
+        info: FieldTypeInfo,
+        is_required: bool,
+        default_value: Any,
+        is_nullable: bool,
+    ) -> NamespaceParser:
+        assert len(info.args) == 1
+        item_type = info.args[0]
+        item_origin, item_args = get_origin_and_args(item_type)
+        self.parser.add_argument(
+            argname.get_argname(),
+            nargs="*",
+            **self.get_add_argument_options(
+                argname,
+                field,
+                item_type,
+                default_value,
+                is_required,
+                is_nullable=False,
+                origin=item_origin,
+                args=item_args,
+            ),
+        )
+        if info.origin is set:
             return SingleFieldParser(
-                argname.get_fieldname(), default_value=default_value
+                argname.get_fieldname(),
+                default_value=default_value,
+                postprocess=set,
             )
+        return SingleFieldParser(argname.get_fieldname(), default_value=default_value)
 
-        raise NotSupportedType(argname, field_type)
+    def _add_dict_field(
+        self,
+        argname: ArgumentName,
+        field: Field,
+        info: FieldTypeInfo,
+        is_required: bool,
+        default_value: Any,
+        is_nullable: bool,
+    ) -> NamespaceParser:
+        self.parser.add_argument(
+            argname.get_argname(),
+            **self.get_add_argument_options(
+                argname,
+                field,
+                info.field_type,
+                default_value,
+                is_required,
+                is_nullable=False,
+                origin=info.origin,
+                args=info.args,
+            ),
+        )
+        return SingleFieldParser(argname.get_fieldname(), default_value=default_value)
+
+    # names of the methods to add a field by the origin of its type, types with other origins are not supported.
+    # methods are looked up on the instance so that subclasses can override them
+    _add_field_fns = {
+        None: "_add_scalar_field",
+        Literal: "_add_scalar_field",
+        list: "_add_sequence_field",
+        set: "_add_sequence_field",
+        abc.Sequence: "_add_sequence_field",
+        dict: "_add_dict_field",
+    }
 
     def get_add_argument_options(
         self,
@@ -356,7 +531,16 @@ class YadaParser(Generic[C, R]):
         default_value: Any,
         is_required: bool,
         is_nullable: bool,
+        origin: Any = MISSING,
+        args: Tuple[Any, ...] = (),
     ) -> dict:
+        """Get options for `argparse.ArgumentParser.add_argument` of a field.
+
+        `origin` and `args` are `get_origin(field_type)` and `get_args(field_type)`, they are computed
+        if not provided.
+        """
+        # keywords that are parsed as None, or None if the value is not nullable (i.e., no need to wrap the parser)
+        none_keywords: Optional[FrozenSet[str]]
         if is_nullable:
             if field_type is str:
                 # for a string, we do not know if the value can contain "None" or "none"
@@ -364,50 +548,52 @@ class YadaParser(Generic[C, R]):
                 #   they don't pass the argument
                 # - if the default value is not None, then we need to have a way to
                 #   distinguish between None and "None" or "none"
-                if default_value is None and "none_keywords" not in field.metadata:
-                    wrapper = lambda x: x
+                if "none_keywords" in field.metadata:
+                    none_keywords = frozenset(field.metadata["none_keywords"])
+                elif default_value is None:
+                    none_keywords = None
                 else:
-                    if "none_keywords" not in field.metadata:
-                        # force to use "None" or "none" as users has no way to specify None
-                        wrapper = StringParser.wrap_nullable
-                    else:
-                        wrapper = partial(
-                            StringParser.wrap_nullable,
-                            none_keywords=set(field.metadata["none_keywords"]),
-                        )
+                    # force to use "None" or "none" as users has no way to specify None
+                    none_keywords = NONE_VALUES
             else:
-                wrapper = StringParser.wrap_nullable
+                none_keywords = NONE_VALUES
         else:
-            wrapper = lambda x: x
+            none_keywords = None
 
-        options = {
-            "default": MISSING,
-            "required": is_required,
-            "help": field.metadata.get("help", ""),
-        }
+        options = _ADD_ARGUMENT_OPTIONS.copy()
+        options["required"] = is_required
+        options["help"] = field.metadata.get("help", "")
         if field_type is bool:
             options["type"] = StringParser(argname).bool
-        elif field_type in self.type_parsers:
-            options["type"] = wrapper(self.type_parsers.get(field_type, field_type))
-        elif argname in self.field_parsers:
-            options["type"] = wrapper(self.field_parsers.get(argname, field_type))
-        elif "parser" in field.metadata:
-            options["type"] = wrapper(field.metadata["parser"])
-        else:
-            origin = get_origin(field_type)
+            return options
+
+        # custom parsers, by priority: type_parsers, field_parsers, then the field's metadata
+        type_parser = self.type_parsers.get(field_type, MISSING)
+        if type_parser is MISSING and self.field_parsers:
+            # keys of field_parsers are always separated by dot regardless of levelsep
+            type_parser = self.field_parsers.get(".".join(argname.names), MISSING)
+        if type_parser is MISSING:
+            type_parser = field.metadata.get("parser", MISSING)
+
+        if type_parser is MISSING:
+            if origin is MISSING:
+                origin, args = get_origin_and_args(field_type)
             if origin is Literal:
-                args = get_args(field_type)
                 # Note: inclusion in the choices container is checked after any type conversions have been performed
                 # https://docs.python.org/3/library/argparse.html#choices
-                arg_types = list({type(arg) for arg in args})
-                if len(arg_types) == 1:
-                    field_type_parser = arg_types[0]
+                arg_type = type(args[0])
+                if all(type(arg) is arg_type for arg in args[1:]):
+                    type_parser = arg_type
                 else:
-                    field_type_parser = StringParser(argname).literal
+                    type_parser = StringParser.literal
                 options["choices"] = args
-                options["type"] = wrapper(field_type_parser)
             else:
-                options["type"] = wrapper(field_type)
+                type_parser = field_type
+
+        if none_keywords is None:
+            options["type"] = type_parser
+        else:
+            options["type"] = StringParser.wrap_nullable(type_parser, none_keywords)
         return options
 
 